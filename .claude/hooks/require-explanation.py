@@ -8,21 +8,78 @@ tagged explanation. If not, it denies the request and tells Claude to explain fi
 """
 
 import json
+import mmap
+import os
 import sys
 
 
+# Marker Claude must put at the start of its explanation
+EXPLANATION_TAG = "[permission_explanation]"
+
+# Tools that don't warrant an explanation
+SKIP_TOOLS = frozenset({"Read", "Glob", "Grep", "TodoRead", "TodoWrite", "TaskCreate",
+                        "TaskUpdate", "TaskGet", "TaskList", "AskUserQuestion"})
+
+# Read size for the fallback reader, used when the transcript can't be mapped
+BLOCK_SIZE = 64 * 1024
+
+
+def _read_lines_reversed_in_blocks(f):
+    """Yield the lines of a binary file from last to first, reading backwards in blocks."""
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    # Fragments of a line that spans block boundaries, newest first. Joining
+    # them once keeps long lines (e.g. big tool results) linear to read.
+    pending = []
+    while position > 0:
+        read_size = min(BLOCK_SIZE, position)
+        position -= read_size
+        f.seek(position)
+        block = f.read(read_size)
+        lines = block.split(b"\n")
+        if len(lines) == 1:
+            pending.append(block)
+            continue
+        pending.append(lines.pop())
+        yield b"".join(reversed(pending))
+        for line in reversed(lines[1:]):
+            yield line
+        pending = [lines[0]]
+    yield b"".join(reversed(pending))
+
+
+def _read_lines_reversed(f):
+    """Yield the lines of a binary file from last to first, without reading it all in."""
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Empty files, special files and some FUSE or network mounts can't be
+        # mapped — read them in blocks instead
+        yield from _read_lines_reversed_in_blocks(f)
+        return
+    # Only the pages near the end that we actually look at get read from disk
+    with mm:
+        end = len(mm)
+        while end >= 0:
+            start = mm.rfind(b"\n", 0, end) + 1
+            yield mm[start:end]
+            end = start - 1
+
+
 def get_last_assistant_text(transcript_path):
     """Read the transcript and return the text content of the last assistant message."""
-    last_text = ""
     try:
-        with open(transcript_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
+        with open(transcript_path, "rb") as f:
+            # Walk the transcript from the end so we stop at the last assistant
+            # message instead of parsing the whole session.
+            for line in _read_lines_reversed(f):
+                # Only assistant entries matter, so skip decoding anything that
+                # can't be one (tool results and user turns are the bulk of it)
+                if b'"assistant"' not in line:
                     continue
                 try:
                     entry = json.loads(line)
-                except json.JSONDecodeError:
+                except ValueError:
                     continue
 
                 msg = entry.get("message", {})
@@ -31,21 +88,21 @@ def get_last_assistant_text(transcript_path):
 
                 content = msg.get("content", [])
                 if isinstance(content, str):
-                    last_text = content
-                    continue
-
-                # Content is a list of blocks — extract text blocks
-                text_parts = []
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        text_parts.append(block.get("text", ""))
-                if text_parts:
-                    last_text = "\n".join(text_parts)
+                    return content
+
+                # Content is a list of blocks — join the text blocks of this
+                # message only; tool-use-only messages fall through to earlier ones
+                text_blocks = [
+                    block for block in content
+                    if isinstance(block, dict) and block.get("type") == "text"
+                ]
+                if text_blocks:
+                    return "\n".join(block.get("text", "") for block in text_blocks)
     except (FileNotFoundError, PermissionError):
         # If we can't read the transcript, don't block the action
         return None
 
-    return last_text
+    return ""
 
 
 def main():
@@ -54,19 +111,20 @@ def main():
     tool_name = hook_input.get("tool_name", "")
 
     # Only enforce for tools that warrant an explanation
-    skip_tools = {"Read", "Glob", "Grep", "TodoRead", "TodoWrite", "TaskCreate",
-                  "TaskUpdate", "TaskGet", "TaskList", "AskUserQuestion"}
-    if tool_name in skip_tools:
+    if tool_name in SKIP_TOOLS:
         sys.exit(0)
 
-    last_text = get_last_assistant_text(transcript_path)
+    # Use the message from the hook input when provided, to skip the transcript
+    last_text = hook_input.get("last_assistant_message")
+    if not isinstance(last_text, str):
+        last_text = get_last_assistant_text(transcript_path)
 
     # If we couldn't read the transcript, don't block
     if last_text is None:
         sys.exit(0)
 
     # Check for the explanation marker
-    if "[permission_explanation]" in last_text:
+    if EXPLANATION_TAG in last_text:
         sys.exit(0)
 
     # No explanation found — deny and ask Claude to explain
@@ -77,7 +135,7 @@ def main():
                 "behavior": "deny",
                 "message": (
                     "You must explain this action to the user in plain language "
-                    "before running it. Start with the tag [permission_explanation] "
+                    f"before running it. Start with the tag {EXPLANATION_TAG} "
                     "on its own line, then explain: what you're about to do, what "
                     "data is involved, whether it's reversible, and whether anything "
                     "leaves the machine. Then try again."
@@ -14,9 +14,10 @@ Usage:
   python3 configure.py <project_dir> open           # Apply open profile
 """
 
-import argparse
+import functools
 import json
 import os
+import re
 import sys
 
 
@@ -82,7 +83,7 @@ PROFILES = {
 # Plain-language translation tables
 # ---------------------------------------------------------------------------
 
-DENY_TRANSLATIONS = [
+DENY_TRANSLATIONS = (
     # (pattern_substring, plain_language)
     # Order matters — first match wins and deduplicates, so Bash patterns
     # (which are unique per rule) come before path patterns (which repeat
@@ -100,17 +101,17 @@ DENY_TRANSLATIONS = [
     ("~/.config/gh/", "Access GitHub tokens (~/.config/gh/)"),
     ("*.pem", "Read or write certificate files (*.pem)"),
     ("*.key", "Read or write key files (*.key)"),
-]
+)
 
-ASK_TRANSLATIONS = [
+ASK_TRANSLATIONS = (
     ("git push", "Push code to GitHub (git push)"),
     ("npm install", "Install npm packages (npm install)"),
     ("pip install", "Install Python packages (pip install)"),
     ("pip3 install", "Install Python packages (pip3 install)"),
     ("brew install", "Install Homebrew packages (brew install)"),
-]
+)
 
-ALLOW_TRANSLATIONS = [
+ALLOW_TRANSLATIONS = (
     ("Edit(**)", "Edit any file in the project"),
     ("Write(**)", "Create or overwrite any file in the project"),
     ("Bash(npm run *)", "Run npm scripts (npm run)"),
@@ -125,49 +126,117 @@ ALLOW_TRANSLATIONS = [
     ("Bash(git diff*)", "View code changes (git diff)"),
     ("Bash(git checkout *)", "Switch branches (git checkout)"),
     ("Bash(git branch *)", "Manage branches (git branch)"),
-]
+)
 
 
-def translate_rules(rules, translation_table):
-    """Translate permission rules to plain English using the lookup table."""
+def _compile_table(translation_table):
+    """Compile a translation table into a single regex, one alternative per pattern."""
+    # Each alternative is anchored at the start of the rule and tried in table
+    # order, so the first pattern found anywhere in the rule wins — the same
+    # result as checking the patterns one by one.
+    return re.compile(
+        "|".join(f".*?({re.escape(pattern)})" for pattern, _ in translation_table),
+        re.DOTALL,
+    )
+
+
+def _exact_matches(translation_table):
+    """Map patterns to descriptions for rules that are exactly equal to a pattern."""
+    # Only safe when no earlier pattern is contained in this one, otherwise
+    # the earlier pattern would win the substring scan
+    exact = {}
+    for index, (pattern, description) in enumerate(translation_table):
+        if not any(earlier in pattern for earlier, _ in translation_table[:index]):
+            exact.setdefault(pattern, description)
+    return exact
+
+
+TRANSLATION_TABLES = {
+    "deny": DENY_TRANSLATIONS,
+    "ask": ASK_TRANSLATIONS,
+    "allow": ALLOW_TRANSLATIONS,
+}
+
+# Built once at import: (exact, matcher, descriptions) keyed by table name
+_TABLE_MATCHERS = {
+    name: (
+        _exact_matches(table),
+        _compile_table(table),
+        tuple(desc for _, desc in table),
+    )
+    for name, table in TRANSLATION_TABLES.items()
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _translate_one(rule, table_name):
+    """Translate a single rule, falling back to the raw rule if nothing matches."""
+    exact, matcher, descriptions = _TABLE_MATCHERS[table_name]
+    # Most allow rules are written exactly as the table pattern
+    description = exact.get(rule)
+    if description is not None:
+        return description
+    match = matcher.match(rule)
+    if match:
+        return descriptions[match.lastindex - 1]
+    # No translation found — show the raw rule
+    return rule
+
+
+def translate_rules(rules, table_name):
+    """Translate permission rules to plain English using the named lookup table."""
     seen = set()
     translated = []
     for rule in rules:
-        matched = False
-        for pattern, description in translation_table:
-            if pattern in rule:
-                matched = True
-                if description not in seen:
-                    seen.add(description)
-                    translated.append(description)
-                break
-        if not matched:
-            # No translation found — show the raw rule
-            if rule not in seen:
-                seen.add(rule)
-                translated.append(rule)
+        description = _translate_one(rule, table_name)
+        if description not in seen:
+            seen.add(description)
+            translated.append(description)
     return translated
 
 
+# Profiles are fixed, so their allow sets and translations are computed once
+_PROFILE_ALLOW_SETS = {
+    name: frozenset(profile["allow"]) for name, profile in PROFILES.items()
+}
+_PROFILE_ALLOW_DESCRIPTIONS = {
+    name: {rule: _translate_one(rule, "allow") for rule in profile["allow"]}
+    for name, profile in PROFILES.items()
+}
+_PROFILE_ALLOW_TRANSLATED = {
+    name: tuple(dict.fromkeys(descriptions.values()))
+    for name, descriptions in _PROFILE_ALLOW_DESCRIPTIONS.items()
+}
+
+
 # ---------------------------------------------------------------------------
 # File I/O
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
+def _claude_dir(project_dir):
+    """Return the .claude directory path for a project."""
+    return os.path.join(project_dir, ".claude")
+
+
 def read_settings(project_dir, filename):
     """Read a settings JSON file, returning empty dict if missing."""
-    path = os.path.join(project_dir, ".claude", filename)
-    if not os.path.exists(path):
+    path = os.path.join(_claude_dir(project_dir), filename)
+    # Opening directly checks existence without a separate stat
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
 
 
 def write_local_settings(project_dir, data):
     """Write settings.local.json with 2-space indent."""
-    path = os.path.join(project_dir, ".claude", "settings.local.json")
+    path = os.path.join(_claude_dir(project_dir), "settings.local.json")
+    # Serialize up front so the file is written in one call
+    content = json.dumps(data, indent=2) + "\n"
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
+        f.write(content)
 
 
 # ---------------------------------------------------------------------------
@@ -176,26 +245,29 @@ def write_local_settings(project_dir, data):
 
 def cmd_help():
     """Show help with profile descriptions."""
-    print("=== Configure Permissions ===")
-    print()
-    print("Choose a profile to control how much Claude asks before acting.")
-    print("Profiles set your personal settings (settings.local.json).")
-    print("The project's security rules (settings.json) always apply on top.")
-    print()
-    print("Usage:")
-    print("  /configure-permissions show       Show your current permissions")
-    print("  /configure-permissions cautious    Apply the Cautious profile")
-    print("  /configure-permissions standard    Apply the Standard profile")
-    print("  /configure-permissions open         Apply the Open profile")
-    print()
-    print("Profiles:")
-    print()
+    out = []
+    out.append("=== Configure Permissions ===")
+    out.append("")
+    out.append("Choose a profile to control how much Claude asks before acting.")
+    out.append("Profiles set your personal settings (settings.local.json).")
+    out.append("The project's security rules (settings.json) always apply on top.")
+    out.append("")
+    out.append("Usage:")
+    out.append("  /configure-permissions show       Show your current permissions")
+    out.append("  /configure-permissions cautious    Apply the Cautious profile")
+    out.append("  /configure-permissions standard    Apply the Standard profile")
+    out.append("  /configure-permissions open         Apply the Open profile")
+    out.append("")
+    out.append("Profiles:")
+    out.append("")
     for name, profile in PROFILES.items():
         label = f"  {name.upper()} — \"{profile['description']}\""
-        print(label)
-        print(f"    {profile['detail']}")
-        print()
-    print("For a full explanation of permissions, see .claude/PERMISSIONS.md")
+        out.append(label)
+        out.append(f"    {profile['detail']}")
+        out.append("")
+    out.append("For a full explanation of permissions, see .claude/PERMISSIONS.md")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_show(project_dir):
@@ -210,44 +282,47 @@ def cmd_show(project_dir):
     ask_rules = team_perms.get("ask", [])
     allow_rules = personal_perms.get("allow", [])
 
-    print("=== Your Current Permissions ===")
-    print()
-    print("PROJECT DEFAULTS (shared in settings.json)")
-    print("These are the recommended security baseline for this project.")
-    print("They can be changed by editing .claude/settings.json directly,")
-    print("but you should understand what each rule protects before removing it.")
-    print()
+    out = []
+    out.append("=== Your Current Permissions ===")
+    out.append("")
+    out.append("PROJECT DEFAULTS (shared in settings.json)")
+    out.append("These are the recommended security baseline for this project.")
+    out.append("They can be changed by editing .claude/settings.json directly,")
+    out.append("but you should understand what each rule protects before removing it.")
+    out.append("")
 
     if deny_rules:
-        print("  Blocked:")
-        for desc in translate_rules(deny_rules, DENY_TRANSLATIONS):
-            print(f"  - {desc}")
+        out.append("  Blocked:")
+        for desc in translate_rules(deny_rules, "deny"):
+            out.append(f"  - {desc}")
     else:
-        print("  Blocked: (none)")
+        out.append("  Blocked: (none)")
 
-    print()
+    out.append("")
 
     if ask_rules:
-        print("  Requires your approval each time:")
-        for desc in translate_rules(ask_rules, ASK_TRANSLATIONS):
-            print(f"  - {desc}")
+        out.append("  Requires your approval each time:")
+        for desc in translate_rules(ask_rules, "ask"):
+            out.append(f"  - {desc}")
     else:
-        print("  Requires your approval each time: (none)")
+        out.append("  Requires your approval each time: (none)")
 
-    print()
-    print("YOUR PERSONAL SETTINGS (in settings.local.json — just for you)")
-    print()
+    out.append("")
+    out.append("YOUR PERSONAL SETTINGS (in settings.local.json — just for you)")
+    out.append("")
 
     if allow_rules:
-        print("  Auto-approved:")
-        for desc in translate_rules(allow_rules, ALLOW_TRANSLATIONS):
-            print(f"  - {desc}")
+        out.append("  Auto-approved:")
+        for desc in translate_rules(allow_rules, "allow"):
+            out.append(f"  - {desc}")
     else:
-        print("  Auto-approved: (none)")
+        out.append("  Auto-approved: (none)")
+
+    out.append("")
+    out.append("To change your personal settings: /configure-permissions cautious | standard | open")
+    out.append("To understand the project defaults: see .claude/PERMISSIONS.md")
 
-    print()
-    print("To change your personal settings: /configure-permissions cautious | standard | open")
-    print("To understand the project defaults: see .claude/PERMISSIONS.md")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_apply_profile(project_dir, profile_name):
@@ -267,70 +342,82 @@ def cmd_apply_profile(project_dir, profile_name):
         new_settings["permissions"] = {"allow": []}
 
     # Show what's changing
-    print(f"=== Applying {profile_name.upper()} profile ===")
-    print(f'"{profile["description"]}"')
-    print()
-
-    if current_allow == new_allow:
-        print("No changes needed — you're already using this profile.")
-        print()
+    out = []
+    out.append(f"=== Applying {profile_name.upper()} profile ===")
+    out.append(f'"{profile["description"]}"')
+    out.append("")
+
+    current_set = set(current_allow)
+    new_set = _PROFILE_ALLOW_SETS[profile_name]
+
+    # Compare as sets so a reordered file doesn't count as a change
+    if current_set == new_set:
+        out.append("No changes needed — you're already using this profile.")
+        out.append("")
     else:
         # Show removals
-        removed = [r for r in current_allow if r not in new_allow]
-        added = [r for r in new_allow if r not in current_allow]
+        removed = [r for r in current_allow if r not in new_set]
+        added = [r for r in new_allow if r not in current_set]
 
         if removed:
-            print("Removing auto-approvals:")
-            for desc in translate_rules(removed, ALLOW_TRANSLATIONS):
-                print(f"  - {desc}")
-            print()
+            out.append("Removing auto-approvals:")
+            for desc in translate_rules(removed, "allow"):
+                out.append(f"  - {desc}")
+            out.append("")
 
         if added:
-            print("Adding auto-approvals:")
-            for desc in translate_rules(added, ALLOW_TRANSLATIONS):
-                print(f"  + {desc}")
-            print()
+            out.append("Adding auto-approvals:")
+            # added is a subset of the profile, so reuse its translations
+            new_descriptions = _PROFILE_ALLOW_DESCRIPTIONS[profile_name]
+            for desc in dict.fromkeys(new_descriptions[r] for r in added):
+                out.append(f"  + {desc}")
+            out.append("")
 
         write_local_settings(project_dir, new_settings)
-        print("Saved to .claude/settings.local.json")
-        print()
+        out.append("Saved to .claude/settings.local.json")
+        out.append("")
 
     if new_allow:
-        print("Your auto-approved actions:")
-        for desc in translate_rules(new_allow, ALLOW_TRANSLATIONS):
-            print(f"  - {desc}")
+        out.append("Your auto-approved actions:")
+        for desc in _PROFILE_ALLOW_TRANSLATED[profile_name]:
+            out.append(f"  - {desc}")
     else:
-        print("Auto-approved actions: (none)")
-        print("Claude will ask before every non-read action.")
+        out.append("Auto-approved actions: (none)")
+        out.append("Claude will ask before every non-read action.")
+
+    out.append("")
+    out.append("Project deny rules still apply — see /configure-permissions show for full details.")
 
-    print()
-    print("Project deny rules still apply — see /configure-permissions show for full details.")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="View and configure Claude Code permission profiles."
-    )
-    parser.add_argument("project_dir", help="Path to the project directory")
-    parser.add_argument(
-        "action",
-        nargs="?",
-        default="help",
-        choices=["help", "show", "cautious", "standard", "open"],
-        help="Command to run (default: help)",
-    )
-    args = parser.parse_args()
+ACTIONS = ("help", "show", "cautious", "standard", "open")
+USAGE = "usage: configure.py <project_dir> [help | show | cautious | standard | open]"
+
 
-    if args.action == "help":
+def main():
+    # Dispatch by hand — argparse costs more to import than this whole CLI needs
+    args = sys.argv[1:]
+    if not 1 <= len(args) <= 2:
+        sys.stderr.write(f"{USAGE}\n")
+        sys.exit(2)
+
+    project_dir = args[0]
+    action = args[1] if len(args) > 1 else "help"
+    if action not in ACTIONS:
+        sys.stderr.write(f"{USAGE}\nconfigure.py: error: unknown action '{action}'\n")
+        sys.exit(2)
+
+    if action == "help":
         cmd_help()
-    elif args.action == "show":
-        cmd_show(args.project_dir)
-    elif args.action in PROFILES:
-        cmd_apply_profile(args.project_dir, args.action)
+    elif action == "show":
+        cmd_show(project_dir)
+    elif action in PROFILES:
+        cmd_apply_profile(project_dir, action)
 
 
 if __name__ == "__main__":